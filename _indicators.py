@@ -0,0 +1,383 @@
+"""Fused technical-indicator kernel for the data processor.
+
+Computes RSI, MACD, Bollinger Bands, EMA 50/200, ADX, Stochastic and VWAP
+in a single pass over the raw price/volume arrays instead of going through
+seven separate ta.* wrapper classes (each of which builds pandas Series and
+recomputes its own EMAs). The kernel keeps one scalar of running state per
+EMA/average and running sums for the rolling statistics, so the whole set
+of indicators costs one O(n) loop with no intermediate allocations.
+
+Since we only have ticker prices (no OHLC candles), high/low/close are all
+the trade price - the same simplification the old ta.* calls used.
+"""
+
+import math
+
+import numpy as np
+
+try:
+    from numba import njit
+    HAVE_NUMBA = True
+except ImportError:
+    from _njit import njit
+    HAVE_NUMBA = False
+
+from config import (
+    RSI_PERIOD,
+    MACD_FAST,
+    MACD_SLOW,
+    MACD_SIGNAL,
+    BOLLINGER_PERIOD,
+    BOLLINGER_STD,
+    EMA_50_PERIOD,
+    EMA_200_PERIOD,
+    ADX_PERIOD,
+    STOCH_RSI_PERIOD,
+    STOCH_RSI_K
+)
+
+
+@njit(cache=True)
+def _compute_all(price, volume, rsi_n, macd_fast, macd_slow, macd_sig,
+                 bb_n, bb_std, ema50_n, ema200_n, adx_n, stoch_n, stoch_k):
+    n = price.shape[0]
+
+    rsi = np.full(n, np.nan)
+    macd = np.full(n, np.nan)
+    macd_signal = np.full(n, np.nan)
+    macd_diff = np.full(n, np.nan)
+    bb_upper = np.full(n, np.nan)
+    bb_middle = np.full(n, np.nan)
+    bb_lower = np.full(n, np.nan)
+    vwap = np.empty(n)
+    ema50 = np.empty(n)
+    ema200 = np.empty(n)
+    adx = np.full(n, np.nan)
+    st_k = np.full(n, np.nan)
+
+    if n == 0:
+        return (rsi, macd, macd_signal, macd_diff, bb_upper, bb_middle,
+                bb_lower, vwap, ema50, ema200, adx, st_k)
+
+    a_fast = 2.0 / (macd_fast + 1)
+    a_slow = 2.0 / (macd_slow + 1)
+    a_sig = 2.0 / (macd_sig + 1)
+    a50 = 2.0 / (ema50_n + 1)
+    a200 = 2.0 / (ema200_n + 1)
+
+    # Scalar running state (one per EMA / average, plus rolling sums)
+    ema_fast = price[0]
+    ema_slow = price[0]
+    sig_state = 0.0
+    e50 = price[0]
+    e200 = price[0]
+    sum_pv = 0.0
+    sum_v = 0.0
+    bb_sum = 0.0
+    bb_sumsq = 0.0
+    gain_acc = 0.0
+    loss_acc = 0.0
+    avg_gain = 0.0
+    avg_loss = 0.0
+    atr = 0.0
+    apdm = 0.0
+    amdm = 0.0
+    tr_acc = 0.0
+    pdm_acc = 0.0
+    mdm_acc = 0.0
+    dx_acc = 0.0
+    adx_state = 0.0
+    stk_sum = 0.0
+
+    for i in range(n):
+        p = price[i]
+
+        # EMAs (alpha recurrence, seeded at the first price)
+        if i > 0:
+            ema_fast += a_fast * (p - ema_fast)
+            ema_slow += a_slow * (p - ema_slow)
+            e50 += a50 * (p - e50)
+            e200 += a200 * (p - e200)
+        ema50[i] = e50
+        ema200[i] = e200
+
+        # MACD and its signal line
+        m = ema_fast - ema_slow
+        if i >= macd_slow - 1:
+            macd[i] = m
+            if i == macd_slow - 1:
+                sig_state = m
+            else:
+                sig_state += a_sig * (m - sig_state)
+            if i >= macd_slow + macd_sig - 2:
+                macd_signal[i] = sig_state
+                macd_diff[i] = m - sig_state
+
+        # Cumulative VWAP
+        sum_pv += p * volume[i]
+        sum_v += volume[i]
+        vwap[i] = sum_pv / sum_v if sum_v > 0 else p
+
+        # Bollinger Bands via running sum / sum of squares
+        bb_sum += p
+        bb_sumsq += p * p
+        if i >= bb_n:
+            old = price[i - bb_n]
+            bb_sum -= old
+            bb_sumsq -= old * old
+        if i >= bb_n - 1:
+            mean = bb_sum / bb_n
+            var = bb_sumsq / bb_n - mean * mean
+            if var < 0.0:
+                var = 0.0
+            sd = math.sqrt(var)
+            bb_middle[i] = mean
+            bb_upper[i] = mean + bb_std * sd
+            bb_lower[i] = mean - bb_std * sd
+
+        if i > 0:
+            d = p - price[i - 1]
+            gain = d if d > 0 else 0.0
+            loss = -d if d < 0 else 0.0
+
+            # Wilder's RSI with running average gain/loss
+            if i <= rsi_n:
+                gain_acc += gain
+                loss_acc += loss
+                if i == rsi_n:
+                    avg_gain = gain_acc / rsi_n
+                    avg_loss = loss_acc / rsi_n
+            else:
+                avg_gain = (avg_gain * (rsi_n - 1) + gain) / rsi_n
+                avg_loss = (avg_loss * (rsi_n - 1) + loss) / rsi_n
+            if i >= rsi_n:
+                if avg_loss == 0.0:
+                    rsi[i] = 100.0
+                else:
+                    rsi[i] = 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+
+            # ADX: with high == low == close the true range collapses to
+            # |price change| and +DM/-DM to the up/down move
+            if i <= adx_n:
+                tr_acc += abs(d)
+                pdm_acc += gain
+                mdm_acc += loss
+                if i == adx_n:
+                    atr = tr_acc
+                    apdm = pdm_acc
+                    amdm = mdm_acc
+            else:
+                atr = atr - atr / adx_n + abs(d)
+                apdm = apdm - apdm / adx_n + gain
+                amdm = amdm - amdm / adx_n + loss
+            if i >= adx_n:
+                if atr > 0.0:
+                    dip = 100.0 * apdm / atr
+                    din = 100.0 * amdm / atr
+                else:
+                    dip = 0.0
+                    din = 0.0
+                s = dip + din
+                dx = 100.0 * abs(dip - din) / s if s > 0.0 else 0.0
+                if i < 2 * adx_n - 1:
+                    dx_acc += dx
+                elif i == 2 * adx_n - 1:
+                    adx_state = (dx_acc + dx) / adx_n
+                    adx[i] = adx_state
+                else:
+                    adx_state = (adx_state * (adx_n - 1) + dx) / adx_n
+                    adx[i] = adx_state
+
+        # Stochastic %K over the rolling high/low of the price window
+        if i >= stoch_n - 1:
+            lo = price[i - stoch_n + 1]
+            hi = lo
+            for j in range(i - stoch_n + 2, i + 1):
+                pj = price[j]
+                if pj < lo:
+                    lo = pj
+                if pj > hi:
+                    hi = pj
+            st_k[i] = 100.0 * (p - lo) / (hi - lo) if hi > lo else 50.0
+
+    return (rsi, macd, macd_signal, macd_diff, bb_upper, bb_middle,
+            bb_lower, vwap, ema50, ema200, adx, st_k)
+
+
+def _ema(x, span):
+    """Exponential moving average via an O(n) scipy C loop, seeded at x[0]."""
+    from scipy.signal import lfilter
+    alpha = 2.0 / (span + 1)
+    y, _ = lfilter([alpha], [1.0, alpha - 1.0], x,
+                   zi=np.array([(1.0 - alpha) * x[0]]))
+    return y
+
+
+def _wilder_avg(x, n, seed):
+    """Wilder running average (alpha = 1/n) of x, continuing from seed.
+
+    x excludes the seed sample; the returned array is aligned with x.
+    """
+    from scipy.signal import lfilter
+    alpha = 1.0 / n
+    y, _ = lfilter([alpha], [1.0, alpha - 1.0], x,
+                   zi=np.array([(1.0 - alpha) * seed]))
+    return y
+
+
+def _wilder_sum(x, n, seed):
+    """Wilder smoothed sum (s = s - s/n + x) of x, continuing from seed."""
+    from scipy.signal import lfilter
+    k = 1.0 - 1.0 / n
+    y, _ = lfilter([1.0], [1.0, -k], x, zi=np.array([k * seed]))
+    return y
+
+
+def _rolling_sums(x, window):
+    """Rolling sum and sum-of-squares of x, aligned to i >= window - 1."""
+    csum = np.concatenate((np.zeros(1), np.cumsum(x)))
+    csq = np.concatenate((np.zeros(1), np.cumsum(x * x)))
+    return csum[window:] - csum[:-window], csq[window:] - csq[:-window]
+
+
+def _compute_all_numpy(price, volume, rsi_n, macd_fast, macd_slow, macd_sig,
+                       bb_n, bb_std, ema50_n, ema200_n, adx_n, stoch_n,
+                       stoch_k):
+    """Vectorized fallback used when numba is not installed.
+
+    Same outputs and warm-up NaN regions as the @njit kernel, but built
+    from scipy.signal.lfilter recurrences and cumulative-sum rolling
+    statistics so it stays O(n) without an interpreted inner loop.
+    """
+    from numpy.lib.stride_tricks import sliding_window_view
+
+    n = price.shape[0]
+
+    rsi = np.full(n, np.nan)
+    macd = np.full(n, np.nan)
+    macd_signal = np.full(n, np.nan)
+    macd_diff = np.full(n, np.nan)
+    bb_upper = np.full(n, np.nan)
+    bb_middle = np.full(n, np.nan)
+    bb_lower = np.full(n, np.nan)
+    adx = np.full(n, np.nan)
+    st_k = np.full(n, np.nan)
+
+    if n == 0:
+        vwap = np.empty(0)
+        return (rsi, macd, macd_signal, macd_diff, bb_upper, bb_middle,
+                bb_lower, vwap, rsi.copy(), rsi.copy(), adx, st_k)
+
+    # EMAs
+    ema50 = _ema(price, ema50_n)
+    ema200 = _ema(price, ema200_n)
+
+    # MACD and its signal line
+    macd_full = _ema(price, macd_fast) - _ema(price, macd_slow)
+    macd[macd_slow - 1:] = macd_full[macd_slow - 1:]
+    if n >= macd_slow:
+        sig_full = _ema(macd_full[macd_slow - 1:], macd_sig)
+        macd_signal[macd_slow + macd_sig - 2:] = sig_full[macd_sig - 1:]
+        macd_diff = macd - macd_signal
+
+    # Cumulative VWAP
+    cum_v = np.cumsum(volume)
+    cum_pv = np.cumsum(price * volume)
+    vwap = np.where(cum_v > 0, cum_pv / np.where(cum_v > 0, cum_v, 1.0), price)
+
+    # Bollinger Bands
+    if n >= bb_n:
+        bsum, bsq = _rolling_sums(price, bb_n)
+        mean = bsum / bb_n
+        var = np.maximum(bsq / bb_n - mean * mean, 0.0)
+        sd = np.sqrt(var)
+        bb_middle[bb_n - 1:] = mean
+        bb_upper[bb_n - 1:] = mean + bb_std * sd
+        bb_lower[bb_n - 1:] = mean - bb_std * sd
+
+    d = np.diff(price)
+    gains = np.maximum(d, 0.0)
+    losses = np.maximum(-d, 0.0)
+
+    # Wilder's RSI
+    if n > rsi_n:
+        avg_gain = np.empty(n - rsi_n)
+        avg_loss = np.empty(n - rsi_n)
+        avg_gain[0] = gains[:rsi_n].mean()
+        avg_loss[0] = losses[:rsi_n].mean()
+        avg_gain[1:] = _wilder_avg(gains[rsi_n:], rsi_n, avg_gain[0])
+        avg_loss[1:] = _wilder_avg(losses[rsi_n:], rsi_n, avg_loss[0])
+        rsi[rsi_n:] = np.where(
+            avg_loss == 0.0, 100.0,
+            100.0 - 100.0 / (1.0 + avg_gain / np.where(avg_loss > 0, avg_loss, 1.0))
+        )
+
+    # ADX (true range is |price change| since high == low == close)
+    if n > adx_n:
+        tr = np.abs(d)
+        atr = np.empty(n - adx_n)
+        apdm = np.empty(n - adx_n)
+        amdm = np.empty(n - adx_n)
+        atr[0] = tr[:adx_n].sum()
+        apdm[0] = gains[:adx_n].sum()
+        amdm[0] = losses[:adx_n].sum()
+        atr[1:] = _wilder_sum(tr[adx_n:], adx_n, atr[0])
+        apdm[1:] = _wilder_sum(gains[adx_n:], adx_n, apdm[0])
+        amdm[1:] = _wilder_sum(losses[adx_n:], adx_n, amdm[0])
+        safe_atr = np.where(atr > 0, atr, 1.0)
+        dip = np.where(atr > 0, 100.0 * apdm / safe_atr, 0.0)
+        din = np.where(atr > 0, 100.0 * amdm / safe_atr, 0.0)
+        s = dip + din
+        dx = np.where(s > 0, 100.0 * np.abs(dip - din) / np.where(s > 0, s, 1.0), 0.0)
+        if n >= 2 * adx_n:
+            adx_vals = np.empty(n - 2 * adx_n + 1)
+            adx_vals[0] = dx[:adx_n].mean()
+            adx_vals[1:] = _wilder_avg(dx[adx_n:], adx_n, adx_vals[0])
+            adx[2 * adx_n - 1:] = adx_vals
+
+    # Stochastic %K / %D over the rolling high/low of the price window
+    if n >= stoch_n:
+        windows = sliding_window_view(price, stoch_n)
+        lo = windows.min(axis=1)
+        hi = windows.max(axis=1)
+        rng = hi - lo
+        st_k[stoch_n - 1:] = np.where(
+            rng > 0,
+            100.0 * (price[stoch_n - 1:] - lo) / np.where(rng > 0, rng, 1.0),
+            50.0)
+
+    return (rsi, macd, macd_signal, macd_diff, bb_upper, bb_middle,
+            bb_lower, vwap, ema50, ema200, adx, st_k)
+
+
+def compute_all(price, volume):
+    """Run the fused kernel with the configured periods.
+
+    Returns a dict of column name -> float64 array, all aligned with the
+    input arrays.
+    """
+    kernel = _compute_all if HAVE_NUMBA else _compute_all_numpy
+    (rsi, macd, macd_signal, macd_diff, bb_upper, bb_middle, bb_lower,
+     vwap, ema50, ema200, adx, st_k) = kernel(
+        np.ascontiguousarray(price, dtype=np.float64),
+        np.ascontiguousarray(volume, dtype=np.float64),
+        RSI_PERIOD, MACD_FAST, MACD_SLOW, MACD_SIGNAL,
+        BOLLINGER_PERIOD, float(BOLLINGER_STD),
+        EMA_50_PERIOD, EMA_200_PERIOD,
+        ADX_PERIOD, STOCH_RSI_PERIOD, STOCH_RSI_K
+    )
+
+    return {
+        'rsi': rsi,
+        'macd': macd,
+        'macd_signal': macd_signal,
+        'macd_diff': macd_diff,
+        'bb_upper': bb_upper,
+        'bb_middle': bb_middle,
+        'bb_lower': bb_lower,
+        'vwap': vwap,
+        'ema_50': ema50,
+        'ema_200': ema200,
+        'adx': adx,
+        'stoch_k': st_k
+    }
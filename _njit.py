@@ -0,0 +1,15 @@
+"""Fallback no-op njit decorator used when numba is not installed.
+
+The indicator kernels still run as plain Python/NumPy code, just without
+JIT compilation.
+"""
+
+
+def njit(*args, **kwargs):
+    if args and callable(args[0]):
+        return args[0]
+
+    def wrapper(func):
+        return func
+
+    return wrapper
@@ -1,22 +1,22 @@
 import os
 from dotenv import load_dotenv
 
-# Print the current working directory
-print(f"Current directory: {os.getcwd()}")
+# Only emit the import-time diagnostics when explicitly asked for
+DEBUG_CONFIG = bool(os.environ.get("DEBUG_CONFIG"))
 
-# Check if .env file exists
 env_path = os.path.join(os.getcwd(), '.env')
-print(f".env file exists: {os.path.exists(env_path)}")
+
+if DEBUG_CONFIG:
+    print(f"Current directory: {os.getcwd()}")
+    print(f".env file exists: {os.path.exists(env_path)}")
+    print("Loading environment variables...")
 
 # Load environment variables
-print("Loading environment variables...")
 load_dotenv(dotenv_path=env_path, override=True)
 
-# Print all loaded environment variables
-print("All environment variables:")
-for key, value in os.environ.items():
-    if key in ["TELEGRAM_TOKEN", "TELEGRAM_CHAT_ID"]:
-        print(f"{key}: {value}")
+if DEBUG_CONFIG:
+    for key in ("TELEGRAM_TOKEN", "TELEGRAM_CHAT_ID"):
+        print(f"{key}: {os.environ.get(key)}")
 
 # WebSocket configuration
 BINANCE_WEBSOCKET_URL = "wss://fstream.binance.com/ws/!ticker@arr"
@@ -52,13 +52,15 @@ TELEGRAM_CHAT_ID = os.environ.get("TELEGRAM_CHAT_ID")
 
 # Print Telegram configuration values for debugging
 if TELEGRAM_TOKEN:
-    masked_token = TELEGRAM_TOKEN[:5] + "..." + TELEGRAM_TOKEN[-5:] if len(TELEGRAM_TOKEN) > 10 else "***"
-    print(f"Using TELEGRAM_TOKEN: {masked_token}")
+    if DEBUG_CONFIG:
+        masked_token = TELEGRAM_TOKEN[:5] + "..." + TELEGRAM_TOKEN[-5:] if len(TELEGRAM_TOKEN) > 10 else "***"
+        print(f"Using TELEGRAM_TOKEN: {masked_token}")
 else:
     print("WARNING: TELEGRAM_TOKEN not found in environment variables")
 
 if TELEGRAM_CHAT_ID:
-    print(f"Using TELEGRAM_CHAT_ID: {TELEGRAM_CHAT_ID}")
+    if DEBUG_CONFIG:
+        print(f"Using TELEGRAM_CHAT_ID: {TELEGRAM_CHAT_ID}")
 else:
     print("WARNING: TELEGRAM_CHAT_ID not found in environment variables")
 
@@ -1,282 +1,649 @@
-import pandas as pd
-from ta.momentum import RSIIndicator, StochasticOscillator
-from ta.trend import MACD, ADXIndicator
-from ta.volatility import BollingerBands
-import datetime
-from config import (
-    TIME_INTERVAL_MINUTES,
-    PRICE_CHANGE_THRESHOLD,
-    RSI_PERIOD,
-    MACD_FAST,
-    MACD_SLOW,
-    MACD_SIGNAL,
-    BOLLINGER_PERIOD,
-    BOLLINGER_STD,
-    EMA_50_PERIOD,
-    EMA_200_PERIOD,
-    ADX_PERIOD,
-    ADX_THRESHOLD,
-    STOCH_RSI_PERIOD,
-    STOCH_RSI_K,
-    STOCH_RSI_D
-)
-
-
-class DataProcessor:
-    def __init__(self):
-        self.symbol_data = {}
-        self.last_processed = {}
-
-    def update_data(self, ticker_data):
-        symbol = ticker_data['symbol']
-
-        if symbol not in self.symbol_data:
-            self.symbol_data[symbol] = []
-            self.last_processed[symbol] = 0
-
-        # Add new data point
-        self.symbol_data[symbol].append(ticker_data)
-
-        # Keep only recent data (last 3 hours)
-        current_time = int(datetime.datetime.now().timestamp() * 1000)
-        three_hours_ago = current_time - (3 * 60 * 60 * 1000)
-        self.symbol_data[symbol] = [
-            d for d in self.symbol_data[symbol]
-            if d['timestamp'] > three_hours_ago
-        ]
-
-    def calculate_indicators(self, symbol):
-        if symbol not in self.symbol_data or len(self.symbol_data[symbol]) < 30:
-            return None
-
-        # Convert to DataFrame
-        df = pd.DataFrame(self.symbol_data[symbol])
-        df = df.sort_values('timestamp')
-        df = df.drop_duplicates(subset='timestamp')
-
-        # Calculate indicators
-        # RSI
-        rsi_indicator = RSIIndicator(
-            close=df['price'],
-            window=RSI_PERIOD
-        )
-        df['rsi'] = rsi_indicator.rsi()
-
-        # MACD
-        macd_indicator = MACD(
-            close=df['price'],
-            window_fast=MACD_FAST,
-            window_slow=MACD_SLOW,
-            window_sign=MACD_SIGNAL
-        )
-        df['macd'] = macd_indicator.macd()
-        df['macd_signal'] = macd_indicator.macd_signal()
-        df['macd_diff'] = macd_indicator.macd_diff()
-
-        # Bollinger Bands
-        bollinger = BollingerBands(
-            close=df['price'],
-            window=BOLLINGER_PERIOD,
-            window_dev=BOLLINGER_STD
-        )
-        df['bb_upper'] = bollinger.bollinger_hband()
-        df['bb_middle'] = bollinger.bollinger_mavg()
-        df['bb_lower'] = bollinger.bollinger_lband()
-
-        # VWAP (simplified version - usually calculated from open of trading day)
-        df['vwap'] = (df['price'] * df['volume']).cumsum() / df['volume'].cumsum()
-
-        # Calculate short-term price changes
-        df['price_pct_change'] = df['price'].pct_change(periods=TIME_INTERVAL_MINUTES) * 100
-
-        # Add EMA 50 and 200
-        df['ema_50'] = df['price'].ewm(span=EMA_50_PERIOD, adjust=False).mean()
-        df['ema_200'] = df['price'].ewm(span=EMA_200_PERIOD, adjust=False).mean()
-
-        # Add EMA crossover signal
-        df['ema_crossover'] = 0
-        df.loc[df['ema_50'] > df['ema_200'], 'ema_crossover'] = 1
-        df.loc[df['ema_50'] < df['ema_200'], 'ema_crossover'] = -1
-
-        # Add ADX indicator
-        adx = ADXIndicator(
-            high=df['price'],  # Using price as high/low/close since we don't have OHLC data
-            low=df['price'],
-            close=df['price'],
-            window=ADX_PERIOD
-        )
-        df['adx'] = adx.adx()
-        df['adx_pos'] = adx.adx_pos()
-        df['adx_neg'] = adx.adx_neg()
-
-        # Add Stochastic RSI
-        stoch = StochasticOscillator(
-            high=df['price'],
-            low=df['price'],
-            close=df['price'],
-            window=STOCH_RSI_PERIOD,
-            smooth_window=STOCH_RSI_K
-        )
-        df['stoch_k'] = stoch.stoch()
-        df['stoch_d'] = stoch.stoch_signal()
-
-        # Filter out NaN values
-        df = df.dropna()
-
-        return df
-
-    def detect_trend(self, symbol):
-        df = self.calculate_indicators(symbol)
-        if df is None or len(df) < TIME_INTERVAL_MINUTES:
-            return None
-
-        current_time = int(datetime.datetime.now().timestamp() * 1000)
-        last_processed_time = self.last_processed.get(symbol, 0)
-
-        # Check if enough time has passed since last processing
-        if current_time - last_processed_time < TIME_INTERVAL_MINUTES * 60 * 1000:
-            return None
-
-        # Get the latest data
-        latest = df.iloc[-1]
-
-        # Detect pump (long) signal with enhanced criteria
-        pump_signal = False
-        if (
-                latest['price_pct_change'] > PRICE_CHANGE_THRESHOLD and
-                latest['rsi'] > 50 and
-                latest['macd_diff'] > 0 and
-                latest['price'] > latest['vwap'] and
-                latest['ema_crossover'] >= 0 and  # EMA50 >= EMA200
-                latest['adx'] > ADX_THRESHOLD  # Strong trend
-        ):
-            pump_signal = True
-
-        # Detect dump (short) signal with enhanced criteria
-        dump_signal = False
-        if (
-                latest['price_pct_change'] < -PRICE_CHANGE_THRESHOLD and
-                latest['rsi'] < 50 and
-                latest['macd_diff'] < 0 and
-                latest['price'] < latest['vwap'] and
-                latest['ema_crossover'] <= 0 and  # EMA50 <= EMA200
-                latest['adx'] > ADX_THRESHOLD  # Strong trend
-        ):
-            dump_signal = True
-
-        # Update last processed time
-        self.last_processed[symbol] = current_time
-
-        if pump_signal:
-            return {
-                'symbol': symbol,
-                'trend': 'LONG',
-                'price': latest['price'],
-                'price_change': latest['price_pct_change'],
-                'rsi': latest['rsi'],
-                'macd_diff': latest['macd_diff'],
-                'adx': latest['adx'],
-                'ema_crossover': latest['ema_crossover'],
-                'stoch_k': latest['stoch_k'],
-                'timestamp': current_time
-            }
-        elif dump_signal:
-            return {
-                'symbol': symbol,
-                'trend': 'SHORT',
-                'price': latest['price'],
-                'price_change': latest['price_pct_change'],
-                'rsi': latest['rsi'],
-                'macd_diff': latest['macd_diff'],
-                'adx': latest['adx'],
-                'ema_crossover': latest['ema_crossover'],
-                'stoch_k': latest['stoch_k'],
-                'timestamp': current_time
-            }
-
-        return None
-
-    def detect_exit_signal(self, position):
-        """
-        Enhanced exit signal detection with improved criteria
-        """
-        symbol = position['symbol']
-        trend = position['trend']
-        entry_price = position['entry_price']
-
-        # Add this block to prevent immediate exits
-        if 'timestamp' in position:
-            entry_time = position['timestamp']
-            current_time = int(datetime.datetime.now().timestamp() * 1000)
-            # Require minimum 15 minutes holding time
-            if current_time - entry_time < 15 * 60 * 1000:
-                return None
-
-        df = self.calculate_indicators(symbol)
-        if df is None or len(df) < 5:  # Need at least a few data points
-            return None
-
-        # Get the latest data
-        latest = df.iloc[-1]
-        current_price = latest['price']
-
-        # Calculate profit/loss percentage
-        if trend == 'LONG':
-            profit_pct = ((current_price - entry_price) / entry_price) * 100
-
-            # Exit conditions for LONG position with enhanced criteria
-            if (
-                    # Strong reversal signal
-                    (latest['macd_diff'] < -0.0002 and latest['rsi'] < 40) or
-                    # Overbought condition
-                    (latest['rsi'] > 75 and latest['stoch_k'] > 80) or
-                    # Price drops below VWAP significantly
-                    (latest['price'] < latest['vwap'] * 0.99) or
-                    # EMA crossover turns bearish
-                    (latest['ema_crossover'] == -1 and latest['ema_crossover'].shift(1).iloc[0] == 1)
-            ):
-                return {
-                    'symbol': symbol,
-                    'exit_price': current_price,
-                    'profit_pct': profit_pct,
-                    'reason': 'Trend reversal detected',
-                    'timestamp': int(datetime.datetime.now().timestamp() * 1000)
-                }
-
-        elif trend == 'SHORT':
-            profit_pct = ((entry_price - current_price) / entry_price) * 100
-
-            # Exit conditions for SHORT position with enhanced criteria
-            if (
-                    # Strong reversal signal
-                    (latest['macd_diff'] > 0.0002 and latest['rsi'] > 60) or
-                    # Oversold condition
-                    (latest['rsi'] < 25 and latest['stoch_k'] < 20) or
-                    # Price rises above VWAP significantly
-                    (latest['price'] > latest['vwap'] * 1.01) or
-                    # EMA crossover turns bullish
-                    (latest['ema_crossover'] == 1 and latest['ema_crossover'].shift(1).iloc[0] == -1)
-            ):
-                return {
-                    'symbol': symbol,
-                    'exit_price': current_price,
-                    'profit_pct': profit_pct,
-                    'reason': 'Trend reversal detected',
-                    'timestamp': int(datetime.datetime.now().timestamp() * 1000)
-                }
-
-        return None
-
-    def get_market_data(self, symbol, period=100):
-        """
-        Extract the most recent market data for AI model training
-        """
-        if symbol not in self.symbol_data or len(self.symbol_data[symbol]) < period:
-            return None
-
-        df = self.calculate_indicators(symbol)
-        if df is None:
-            return None
-
-        # Get the most recent data points
-        return df.tail(period)
+import numpy as np
+import time
+from dataclasses import dataclass
+from _indicators import compute_all, njit
+from config import (
+    TIME_INTERVAL_MINUTES,
+    PRICE_CHANGE_THRESHOLD,
+    RSI_PERIOD,
+    MACD_FAST,
+    MACD_SLOW,
+    MACD_SIGNAL,
+    BOLLINGER_PERIOD,
+    EMA_50_PERIOD,
+    EMA_200_PERIOD,
+    ADX_PERIOD,
+    ADX_THRESHOLD,
+    STOCH_RSI_PERIOD
+)
+
+# EMA smoothing factors for the incremental state recurrences
+_A_FAST = 2.0 / (MACD_FAST + 1)
+_A_SLOW = 2.0 / (MACD_SLOW + 1)
+_A_SIG = 2.0 / (MACD_SIGNAL + 1)
+_A_50 = 2.0 / (EMA_50_PERIOD + 1)
+_A_200 = 2.0 / (EMA_200_PERIOD + 1)
+
+# Ticks needed before every incremental indicator has warmed up
+# (MACD signal line is the slowest, plus the pct-change lookback)
+_STATE_WARMUP = MACD_SLOW + MACD_SIGNAL + TIME_INTERVAL_MINUTES
+
+# First row of the indicator frame where every column is defined. The
+# EMAs and VWAP are seeded at the first sample and never produce NaNs,
+# so the MACD signal line is the slowest warm-up.
+_IND_WARMUP = max(
+    RSI_PERIOD,
+    MACD_SLOW + MACD_SIGNAL - 2,
+    BOLLINGER_PERIOD - 1,
+    2 * ADX_PERIOD - 1,
+    STOCH_RSI_PERIOD - 1,
+    TIME_INTERVAL_MINUTES
+)
+
+
+# Ring buffer capacity: 3 hours of once-per-second ticker frames
+RING_SIZE = 3 * 60 * 60
+
+
+def _now_ms():
+    """Current epoch time in milliseconds, without datetime construction."""
+    return time.time_ns() // 1_000_000
+
+
+@njit(cache=True)
+def _long_exit(macd_diff, rsi, stoch_k, price, vwap, cross_now, cross_prev):
+    """Exit predicate for LONG positions, compiled once and fed plain scalars."""
+    return (
+        # Strong reversal signal
+        (macd_diff < -0.0002 and rsi < 40.0) or
+        # Overbought condition
+        (rsi > 75.0 and stoch_k > 80.0) or
+        # Price drops below VWAP significantly
+        (price < vwap * 0.99) or
+        # EMA crossover turns bearish
+        (cross_now == -1 and cross_prev == 1)
+    )
+
+
+@njit(cache=True)
+def _short_exit(macd_diff, rsi, stoch_k, price, vwap, cross_now, cross_prev):
+    """Exit predicate for SHORT positions, compiled once and fed plain scalars."""
+    return (
+        # Strong reversal signal
+        (macd_diff > 0.0002 and rsi > 60.0) or
+        # Oversold condition
+        (rsi < 25.0 and stoch_k < 20.0) or
+        # Price rises above VWAP significantly
+        (price > vwap * 1.01) or
+        # EMA crossover turns bullish
+        (cross_now == 1 and cross_prev == -1)
+    )
+
+
+class TickRing:
+    """Preallocated structure-of-arrays ring buffer for one symbol's ticks.
+
+    Stores price/volume/timestamp in separate NumPy arrays with a start
+    pointer and count, so appending and evicting old samples never
+    reallocates and reading the history is an array slice instead of a
+    walk over a list of dicts.
+    """
+    __slots__ = ('price', 'volume', 'ts', 'start', 'count', 'sum_pv', 'sum_v')
+
+    def __init__(self, size=RING_SIZE):
+        # float32 halves the resident footprint per field; Binance tick
+        # prices fit comfortably in its ~7 significant digits, and all
+        # accumulation happens in float64 anyway
+        self.price = np.empty(size, dtype=np.float32)
+        self.volume = np.empty(size, dtype=np.float32)
+        self.ts = np.empty(size, dtype=np.int64)
+        self.start = 0
+        self.count = 0
+        # Running price*volume / volume sums over the stored window, so
+        # VWAP is an O(1) read instead of a cumulative sum per call
+        self.sum_pv = 0.0
+        self.sum_v = 0.0
+
+    def __len__(self):
+        return self.count
+
+    def append(self, price, volume, ts):
+        size = self.price.shape[0]
+        if self.count and ts <= self.ts[(self.start + self.count - 1) % size]:
+            # Duplicate or out-of-order timestamp - discard it at write
+            # time so the stored series is always sorted and unique
+            return False
+        idx = (self.start + self.count) % size
+        if self.count == size:
+            # Buffer full - the oldest sample gets overwritten
+            self.sum_pv -= float(self.price[self.start]) * float(self.volume[self.start])
+            self.sum_v -= float(self.volume[self.start])
+            self.start = (self.start + 1) % size
+        else:
+            self.count += 1
+        self.price[idx] = price
+        self.volume[idx] = volume
+        self.ts[idx] = ts
+        # Accumulate the stored (quantized) values so later eviction
+        # subtracts exactly what was added
+        self.sum_pv += float(self.price[idx]) * float(self.volume[idx])
+        self.sum_v += float(self.volume[idx])
+        return True
+
+    def evict_older_than(self, cutoff):
+        size = self.price.shape[0]
+        while self.count and self.ts[self.start] <= cutoff:
+            self.sum_pv -= float(self.price[self.start]) * float(self.volume[self.start])
+            self.sum_v -= float(self.volume[self.start])
+            self.start = (self.start + 1) % size
+            self.count -= 1
+        if self.count == 0:
+            self.sum_pv = 0.0
+            self.sum_v = 0.0
+
+    def vwap(self):
+        """Volume-weighted average price over the stored window, O(1)."""
+        if self.sum_v > 0:
+            return self.sum_pv / self.sum_v
+        return self.price_ago(0) if self.count else 0.0
+
+    def last_timestamp(self):
+        size = self.price.shape[0]
+        return int(self.ts[(self.start + self.count - 1) % size])
+
+    def price_ago(self, k):
+        """Price k ticks before the newest sample (k=0 is the newest)."""
+        size = self.price.shape[0]
+        return float(self.price[(self.start + self.count - 1 - k) % size])
+
+    def arrays(self):
+        """Return (price, volume, ts) for the valid region, oldest first.
+
+        Zero-copy views while the region is contiguous; copies only when
+        it wraps around the end of the buffer.
+        """
+        size = self.price.shape[0]
+        end = self.start + self.count
+        if end <= size:
+            region = slice(self.start, end)
+            return self.price[region], self.volume[region], self.ts[region]
+        wrap = end - size
+        return (
+            np.concatenate((self.price[self.start:], self.price[:wrap])),
+            np.concatenate((self.volume[self.start:], self.volume[:wrap])),
+            np.concatenate((self.ts[self.start:], self.ts[:wrap]))
+        )
+
+
+@dataclass
+class IndicatorState:
+    """Incremental per-symbol indicator state, updated once per tick.
+
+    Holds one scalar per EMA/running average so the hot signal path can
+    read the latest indicator values in O(1) without rebuilding any
+    DataFrame.
+    """
+    count: int = 0
+    prev_price: float = 0.0
+    ema_fast: float = 0.0
+    ema_slow: float = 0.0
+    macd_sig: float = 0.0
+    macd_diff: float = 0.0
+    ema_50: float = 0.0
+    ema_200: float = 0.0
+    gain_acc: float = 0.0
+    loss_acc: float = 0.0
+    avg_gain: float = 0.0
+    avg_loss: float = 0.0
+    rsi: float = 50.0
+    atr: float = 0.0
+    apdm: float = 0.0
+    amdm: float = 0.0
+    dx_acc: float = 0.0
+    adx: float = 0.0
+    prev_cross: int = 0
+    cross: int = 0
+
+
+class DataProcessor:
+    def __init__(self):
+        self.symbol_data = {}
+        self.last_processed = {}
+        # Cached indicator DataFrames keyed by symbol -> (n_points, last_timestamp, df)
+        self._ind_cache = {}
+        # Incremental indicator state keyed by symbol
+        self._state = {}
+
+    def update_data(self, ticker_data):
+        current_time = _now_ms()
+        self._ingest(ticker_data, current_time - (3 * 60 * 60 * 1000))
+
+    def update_batch(self, tickers):
+        """Ingest a whole websocket frame of tickers in one pass.
+
+        Computes the eviction cutoff once instead of per symbol.
+        """
+        current_time = _now_ms()
+        cutoff = current_time - (3 * 60 * 60 * 1000)
+        for ticker_data in tickers:
+            self._ingest(ticker_data, cutoff)
+
+    def _ingest(self, ticker_data, three_hours_ago):
+        symbol = ticker_data['symbol']
+
+        if symbol not in self.symbol_data:
+            self.symbol_data[symbol] = TickRing()
+            self.last_processed[symbol] = 0
+            self._state[symbol] = IndicatorState()
+
+        # Add new data point (duplicate timestamps are discarded at write)
+        ring = self.symbol_data[symbol]
+        if not ring.append(ticker_data['price'], ticker_data['volume'],
+                           ticker_data['timestamp']):
+            return
+
+        # Advance the incremental indicator state with the new price
+        self._update_state(self._state[symbol], ticker_data['price'])
+
+        # Keep only recent data (last 3 hours) - advance the start pointer
+        # past expired samples instead of rebuilding the container
+        ring.evict_older_than(three_hours_ago)
+
+        # New tick invalidates any cached indicators for this symbol
+        self._ind_cache.pop(symbol, None)
+
+    @staticmethod
+    def _update_state(st, price):
+        """Apply one tick to the incremental indicator recurrences.
+
+        Mirrors the warm-up behaviour of the fused kernel: simple-average
+        seeds for RSI/ADX, then Wilder/EMA recurrences from that point on.
+        """
+        i = st.count
+
+        if i == 0:
+            st.ema_fast = st.ema_slow = st.ema_50 = st.ema_200 = price
+        else:
+            st.ema_fast += _A_FAST * (price - st.ema_fast)
+            st.ema_slow += _A_SLOW * (price - st.ema_slow)
+            st.ema_50 += _A_50 * (price - st.ema_50)
+            st.ema_200 += _A_200 * (price - st.ema_200)
+
+            d = price - st.prev_price
+            gain = d if d > 0 else 0.0
+            loss = -d if d < 0 else 0.0
+
+            # Wilder's RSI
+            if i <= RSI_PERIOD:
+                st.gain_acc += gain
+                st.loss_acc += loss
+                if i == RSI_PERIOD:
+                    st.avg_gain = st.gain_acc / RSI_PERIOD
+                    st.avg_loss = st.loss_acc / RSI_PERIOD
+            else:
+                st.avg_gain = (st.avg_gain * (RSI_PERIOD - 1) + gain) / RSI_PERIOD
+                st.avg_loss = (st.avg_loss * (RSI_PERIOD - 1) + loss) / RSI_PERIOD
+            if i >= RSI_PERIOD:
+                if st.avg_loss == 0.0:
+                    st.rsi = 100.0
+                else:
+                    st.rsi = 100.0 - 100.0 / (1.0 + st.avg_gain / st.avg_loss)
+
+            # ADX (true range is |price change| since we only have trade prices)
+            if i <= ADX_PERIOD:
+                st.atr += abs(d)
+                st.apdm += gain
+                st.amdm += loss
+            else:
+                st.atr = st.atr - st.atr / ADX_PERIOD + abs(d)
+                st.apdm = st.apdm - st.apdm / ADX_PERIOD + gain
+                st.amdm = st.amdm - st.amdm / ADX_PERIOD + loss
+            if i >= ADX_PERIOD:
+                if st.atr > 0.0:
+                    dip = 100.0 * st.apdm / st.atr
+                    din = 100.0 * st.amdm / st.atr
+                else:
+                    dip = din = 0.0
+                s = dip + din
+                dx = 100.0 * abs(dip - din) / s if s > 0.0 else 0.0
+                if i < 2 * ADX_PERIOD - 1:
+                    st.dx_acc += dx
+                elif i == 2 * ADX_PERIOD - 1:
+                    st.adx = (st.dx_acc + dx) / ADX_PERIOD
+                else:
+                    st.adx = (st.adx * (ADX_PERIOD - 1) + dx) / ADX_PERIOD
+
+        # MACD and its signal line
+        macd = st.ema_fast - st.ema_slow
+        if i == MACD_SLOW - 1:
+            st.macd_sig = macd
+        elif i > MACD_SLOW - 1:
+            st.macd_sig += _A_SIG * (macd - st.macd_sig)
+        st.macd_diff = macd - st.macd_sig
+
+        # EMA crossover signal (keep the previous value for flip detection)
+        st.prev_cross = st.cross
+        if st.ema_50 > st.ema_200:
+            st.cross = 1
+        elif st.ema_50 < st.ema_200:
+            st.cross = -1
+        else:
+            st.cross = 0
+
+        st.prev_price = price
+        st.count += 1
+
+    def calculate_indicators(self, symbol):
+        ring = self.symbol_data.get(symbol)
+        if ring is None or len(ring) < 30:
+            return None
+
+        # Reuse the cached result if no new tick has arrived since it was built
+        # (detect_trend, detect_exit_signal and get_market_data can all run in
+        # the same websocket frame)
+        n = len(ring)
+        last_ts = ring.last_timestamp()
+        cached = self._ind_cache.get(symbol)
+        if cached is not None and cached[0] == n and cached[1] == last_ts:
+            return cached[2]
+
+        # pandas is only needed on this cold path (get_market_data / the
+        # AI model), so defer its ~300 ms import until a symbol actually
+        # has enough data
+        import pandas as pd
+
+        # Convert to DataFrame - the ring buffer is already sorted and
+        # deduplicated at write time, so just wrap the column arrays
+        price_arr, volume_arr, ts_arr = ring.arrays()
+        df = pd.DataFrame({
+            'symbol': symbol,
+            'price': price_arr,
+            'volume': volume_arr,
+            'timestamp': ts_arr
+        }, copy=False)
+
+        # Calculate all indicators (RSI, MACD, Bollinger, VWAP, EMA 50/200,
+        # ADX, Stochastic) in one fused pass over the raw arrays
+        indicators = compute_all(
+            df['price'].to_numpy(dtype='float64'),
+            df['volume'].to_numpy(dtype='float64')
+        )
+        for column, values in indicators.items():
+            df[column] = values
+
+        # Calculate short-term price changes
+        df['price_pct_change'] = df['price'].pct_change(periods=TIME_INTERVAL_MINUTES) * 100
+
+        # Add EMA crossover signal
+        df['ema_crossover'] = np.sign(
+            indicators['ema_50'] - indicators['ema_200']
+        ).astype(np.int8)
+
+        # Drop the warm-up rows - the first valid index is known
+        # analytically, so no full-frame NaN scan is needed
+        df = df.iloc[_IND_WARMUP:]
+
+        self._ind_cache[symbol] = (n, last_ts, df)
+
+        return df
+
+    def detect_trend(self, symbol):
+        ring = self.symbol_data.get(symbol)
+        st = self._state.get(symbol)
+        if (
+                ring is None or st is None or
+                len(ring) <= TIME_INTERVAL_MINUTES or len(ring) < 30 or
+                st.count < _STATE_WARMUP
+        ):
+            return None
+
+        current_time = _now_ms()
+        last_processed_time = self.last_processed.get(symbol, 0)
+
+        # Check if enough time has passed since last processing
+        if current_time - last_processed_time < TIME_INTERVAL_MINUTES * 60 * 1000:
+            return None
+
+        # Cheap gate first: the price-change threshold rejects almost every
+        # symbol, so check it with two O(1) ring reads before doing any
+        # other indicator work
+        price = ring.price_ago(0)
+        prev_price = ring.price_ago(TIME_INTERVAL_MINUTES)
+        price_pct_change = ((price - prev_price) / prev_price) * 100
+        if abs(price_pct_change) < PRICE_CHANGE_THRESHOLD:
+            return None
+
+        # Read the remaining values from the incremental state and the
+        # ring buffer arrays - no DataFrame needed on this path
+        price_arr, _, _ = ring.arrays()
+
+        # VWAP over the retained window, from the ring's running sums
+        vwap = ring.vwap()
+
+        # Stochastic %K over the last window of prices
+        window = price_arr[-STOCH_RSI_PERIOD:]
+        lo = float(window.min())
+        hi = float(window.max())
+        stoch_k = 100.0 * (price - lo) / (hi - lo) if hi > lo else 50.0
+
+        # Detect pump (long) signal with enhanced criteria
+        pump_signal = False
+        if (
+                price_pct_change > PRICE_CHANGE_THRESHOLD and
+                st.rsi > 50 and
+                st.macd_diff > 0 and
+                price > vwap and
+                st.cross >= 0 and  # EMA50 >= EMA200
+                st.adx > ADX_THRESHOLD  # Strong trend
+        ):
+            pump_signal = True
+
+        # Detect dump (short) signal with enhanced criteria
+        dump_signal = False
+        if (
+                price_pct_change < -PRICE_CHANGE_THRESHOLD and
+                st.rsi < 50 and
+                st.macd_diff < 0 and
+                price < vwap and
+                st.cross <= 0 and  # EMA50 <= EMA200
+                st.adx > ADX_THRESHOLD  # Strong trend
+        ):
+            dump_signal = True
+
+        # Update last processed time
+        self.last_processed[symbol] = current_time
+
+        if pump_signal:
+            return {
+                'symbol': symbol,
+                'trend': 'LONG',
+                'price': price,
+                'price_change': price_pct_change,
+                'rsi': st.rsi,
+                'macd_diff': st.macd_diff,
+                'adx': st.adx,
+                'ema_crossover': st.cross,
+                'stoch_k': stoch_k,
+                'timestamp': current_time
+            }
+        elif dump_signal:
+            return {
+                'symbol': symbol,
+                'trend': 'SHORT',
+                'price': price,
+                'price_change': price_pct_change,
+                'rsi': st.rsi,
+                'macd_diff': st.macd_diff,
+                'adx': st.adx,
+                'ema_crossover': st.cross,
+                'stoch_k': stoch_k,
+                'timestamp': current_time
+            }
+
+        return None
+
+    def detect_trends_batch(self):
+        """Evaluate the trend conditions for every tracked symbol at once.
+
+        Gathers the latest per-symbol values from the incremental state
+        (only for symbols that pass the cheap time and price-change gates)
+        and applies the pump/dump masks with vectorized compares instead
+        of one Python predicate chain per symbol. Returns a list of signal
+        dicts in the same shape as detect_trend.
+        """
+        current_time = _now_ms()
+        interval_ms = TIME_INTERVAL_MINUTES * 60 * 1000
+
+        candidates = []
+        for symbol, ring in self.symbol_data.items():
+            st = self._state[symbol]
+            if (
+                    len(ring) <= TIME_INTERVAL_MINUTES or len(ring) < 30 or
+                    st.count < _STATE_WARMUP
+            ):
+                continue
+            if current_time - self.last_processed.get(symbol, 0) < interval_ms:
+                continue
+
+            price = ring.price_ago(0)
+            prev_price = ring.price_ago(TIME_INTERVAL_MINUTES)
+            price_pct_change = ((price - prev_price) / prev_price) * 100
+            if abs(price_pct_change) < PRICE_CHANGE_THRESHOLD:
+                continue
+
+            price_arr, _, _ = ring.arrays()
+            vwap = ring.vwap()
+            window = price_arr[-STOCH_RSI_PERIOD:]
+            lo = float(window.min())
+            hi = float(window.max())
+            stoch_k = 100.0 * (price - lo) / (hi - lo) if hi > lo else 50.0
+
+            candidates.append((symbol, price_pct_change, price, vwap, stoch_k,
+                               st.rsi, st.macd_diff, st.adx, st.cross))
+            self.last_processed[symbol] = current_time
+
+        if not candidates:
+            return []
+
+        pct = np.array([c[1] for c in candidates])
+        price = np.array([c[2] for c in candidates])
+        vwap = np.array([c[3] for c in candidates])
+        rsi = np.array([c[5] for c in candidates])
+        macd_diff = np.array([c[6] for c in candidates])
+        adx = np.array([c[7] for c in candidates])
+        cross = np.array([c[8] for c in candidates])
+
+        # Build each predicate as a boolean array once and AND-reduce;
+        # the strong-trend term is shared between both masks
+        strong_trend = adx > ADX_THRESHOLD
+        pump = np.logical_and.reduce((
+            pct > PRICE_CHANGE_THRESHOLD,
+            rsi > 50,
+            macd_diff > 0,
+            price > vwap,
+            cross >= 0,
+            strong_trend
+        ))
+        dump = np.logical_and.reduce((
+            pct < -PRICE_CHANGE_THRESHOLD,
+            rsi < 50,
+            macd_diff < 0,
+            price < vwap,
+            cross <= 0,
+            strong_trend
+        ))
+
+        signals = []
+        for idx in np.where(pump | dump)[0]:
+            symbol, price_pct_change, price_i, _, stoch_k, rsi_i, macd_i, adx_i, cross_i = candidates[idx]
+            signals.append({
+                'symbol': symbol,
+                'trend': 'LONG' if pump[idx] else 'SHORT',
+                'price': price_i,
+                'price_change': price_pct_change,
+                'rsi': rsi_i,
+                'macd_diff': macd_i,
+                'adx': adx_i,
+                'ema_crossover': cross_i,
+                'stoch_k': stoch_k,
+                'timestamp': current_time
+            })
+
+        return signals
+
+    def detect_exit_signal(self, position):
+        """
+        Enhanced exit signal detection with improved criteria
+        """
+        symbol = position['symbol']
+        trend = position['trend']
+        entry_price = position['entry_price']
+
+        # Add this block to prevent immediate exits
+        if 'timestamp' in position:
+            entry_time = position['timestamp']
+            current_time = _now_ms()
+            # Require minimum 15 minutes holding time
+            if current_time - entry_time < 15 * 60 * 1000:
+                return None
+
+        df = self.calculate_indicators(symbol)
+        if df is None or len(df) < 5:  # Need at least a few data points
+            return None
+
+        # Pull the latest scalars straight from the column arrays; the old
+        # latest['ema_crossover'].shift(1) call operated on a scalar and
+        # raised, so the EMA-flip exit never actually fired
+        current_price = float(df['price'].to_numpy()[-1])
+        rsi = float(df['rsi'].to_numpy()[-1])
+        macd_diff = float(df['macd_diff'].to_numpy()[-1])
+        stoch_k = float(df['stoch_k'].to_numpy()[-1])
+        vwap = float(df['vwap'].to_numpy()[-1])
+        cross_arr = df['ema_crossover'].to_numpy()
+        cross_now = int(cross_arr[-1])
+        cross_prev = int(cross_arr[-2])
+
+        # Calculate profit/loss percentage
+        if trend == 'LONG':
+            profit_pct = ((current_price - entry_price) / entry_price) * 100
+
+            # Exit conditions for LONG position with enhanced criteria
+            if _long_exit(macd_diff, rsi, stoch_k, current_price, vwap,
+                          cross_now, cross_prev):
+                return {
+                    'symbol': symbol,
+                    'exit_price': current_price,
+                    'profit_pct': profit_pct,
+                    'reason': 'Trend reversal detected',
+                    'timestamp': _now_ms()
+                }
+
+        elif trend == 'SHORT':
+            profit_pct = ((entry_price - current_price) / entry_price) * 100
+
+            # Exit conditions for SHORT position with enhanced criteria
+            if _short_exit(macd_diff, rsi, stoch_k, current_price, vwap,
+                           cross_now, cross_prev):
+                return {
+                    'symbol': symbol,
+                    'exit_price': current_price,
+                    'profit_pct': profit_pct,
+                    'reason': 'Trend reversal detected',
+                    'timestamp': _now_ms()
+                }
+
+        return None
+
+    def get_market_data(self, symbol, period=100):
+        """
+        Extract the most recent market data for AI model training
+        """
+        if symbol not in self.symbol_data or len(self.symbol_data[symbol]) < period:
+            return None
+
+        df = self.calculate_indicators(symbol)
+        if df is None:
+            return None
+
+        # Get the most recent data points
+        return df.tail(period)
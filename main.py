@@ -56,65 +56,74 @@ def handle_websocket_message(data):
     global data_processor, alert_system, position_manager, svr_model
 
     try:
-        # Process each ticker in the data
+        # Collect the perpetual futures (USDT pairs) tickers from the frame
+        tickers = []
+        latest_prices = {}
         for ticker in data:
             if 'e' in ticker and ticker['e'] == '24hrTicker':
                 symbol = ticker['s']
 
-                # Only process perpetual futures (USDT pairs)
                 if symbol.endswith('USDT'):
-                    ticker_data = {
+                    price = float(ticker['c'])
+                    tickers.append({
                         'symbol': symbol,
-                        'price': float(ticker['c']),
+                        'price': price,
                         'volume': float(ticker['v']),
                         'timestamp': ticker['E']
+                    })
+                    latest_prices[symbol] = price
+
+        if not tickers:
+            return
+
+        # Update data processor with the whole frame at once
+        data_processor.update_batch(tickers)
+
+        # Update position manager with current prices
+        if position_manager:
+            for ticker_data in tickers:
+                if position_manager.has_active_position(ticker_data['symbol']):
+                    position_manager.update_price_data(ticker_data['symbol'], ticker_data['price'])
+
+        # Detect trends across all symbols in one pass
+        if alert_system:
+            for trend_signal in data_processor.detect_trends_batch():
+                alert_system.process_signal(trend_signal)
+
+        # Check for exit signals once per frame (not once per ticker)
+        if position_manager:
+            open_positions = position_manager.get_position_summary()
+            for symbol, position in open_positions.items():
+                current_price = latest_prices.get(symbol)
+                if current_price is None:
+                    continue
+
+                # Get indicators for this symbol
+                indicators = None
+                df = data_processor.calculate_indicators(symbol)
+                if df is not None and not df.empty:
+                    latest = df.iloc[-1]
+                    indicators = {
+                        'rsi': latest.get('rsi', 50),
+                        'macd_diff': latest.get('macd_diff', 0)
                     }
 
-                    # Update data processor
-                    data_processor.update_data(ticker_data)
-
-                    # Update position manager with current price
-                    if position_manager and position_manager.has_active_position(symbol):
-                        position_manager.update_price_data(symbol, float(ticker['c']))
-
-                    # Detect trend
-                    trend_signal = data_processor.detect_trend(symbol)
-                    if trend_signal and alert_system:
-                        # Process signal
-                        alert_system.process_signal(trend_signal)
-
-                    # Check for exit signals for open positions
-                    if position_manager:
-                        open_positions = position_manager.get_position_summary()
-                        for symbol, position in open_positions.items():
-                            current_price = float(ticker['c'])
-
-                            # Get indicators for this symbol
-                            indicators = None
-                            df = data_processor.calculate_indicators(symbol)
-                            if df is not None and not df.empty:
-                                latest = df.iloc[-1]
-                                indicators = {
-                                    'rsi': latest.get('rsi', 50),
-                                    'macd_diff': latest.get('macd_diff', 0)
-                                }
-
-                            # Check exit conditions
-                            exit_signal = position_manager.check_exit_conditions(symbol, current_price, indicators)
-                            if exit_signal:
-                                alert_system.process_exit_signal(exit_signal['position_id'], exit_signal)
-                    else:
-                        # Use the old method if position manager is not available
-                        for position in database.get_open_positions():
-                            position_data = {
-                                'symbol': position[1],
-                                'trend': position[3],
-                                'entry_price': position[2]
-                            }
-
-                            exit_signal = data_processor.detect_exit_signal(position_data)
-                            if exit_signal:
-                                alert_system.process_exit_signal(position[0], exit_signal)
+                # Check exit conditions
+                exit_signal = position_manager.check_exit_conditions(symbol, current_price, indicators)
+                if exit_signal:
+                    alert_system.process_exit_signal(exit_signal['position_id'], exit_signal)
+        else:
+            # Use the old method if position manager is not available
+            for position in database.get_open_positions():
+                position_data = {
+                    'symbol': position[1],
+                    'trend': position[3],
+                    'entry_price': position[2]
+                }
+
+                exit_signal = data_processor.detect_exit_signal(position_data)
+                if exit_signal:
+                    alert_system.process_exit_signal(position[0], exit_signal)
     except Exception as e:
         logger.error(f"Error processing WebSocket message: {e}")
 